@@ -32,14 +32,15 @@ import torchlite.pandas.splitter as tsplitter
 
 def to_csv(test_file, output_file, identifier_field, predicted_field,
            predictions, read_format='csv'):
+    # Only the identifier column is needed, skip parsing the rest of the table
     df = None
     if read_format == 'csv':
-        df = pd.read_csv(test_file)
+        df = pd.read_csv(test_file, usecols=[identifier_field])
     elif read_format == 'feather':
-        df = pd.read_feather(test_file)
-    df = df[[identifier_field]]
-    df[predicted_field] = predictions
-    df.to_csv(output_file, index=False)
+        df = pd.read_feather(test_file, columns=[identifier_field])
+    # An ndarray assignment skips pandas type inference on a plain list
+    df[predicted_field] = np.asarray(predictions)
+    df.to_csv(output_file, index=False, chunksize=65536)
 
 
 def get_elapsed(df, monitored_field, prefix='elapsed_'):
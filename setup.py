@@ -33,9 +33,10 @@ setup(
     keywords='development',
     packages=find_packages(exclude=['tests']),
     install_requires=["isoweek", "tqdm", "bcolz", "kaggle_data", "opencv_python", "torch", "torchvision",
-                      "tensorflow-gpu", "scikit_image", "setuptools", "numpy", "matplotlib", "scipy", "Pillow",
+                      "scikit_image", "setuptools", "numpy", "matplotlib", "scipy", "Pillow",
                       "scikit_learn", "tensorboardX", "typing", "PyYAML", "Augmentor", "feather-format",
-                      "fuzzywuzzy", "python-Levenshtein", "category_encoders",
-                      find_packages(exclude=["*.tests", "*.tests.*", "tests.*",
-                                             "tests", "torchlite.*", "torchvision.*"])],
+                      "fuzzywuzzy", "python-Levenshtein", "category_encoders"],
+    extras_require={
+        "tf": ["tensorflow-gpu"],
+    },
 )
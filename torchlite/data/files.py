@@ -2,51 +2,164 @@
  A file to cache data for faster loading.
  E.g: Images turned to bcolz files
 """
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import shutil
 import bcolz
+import cv2
 import numpy as np
-from skimage import io
 from tqdm import tqdm
 import os
 
 
-def to_blosc_arrays(files, to_dir):
+def _cache_one(file_path, img_blosc_path, cparams):
+    """
+    Read one image and store it as a blosc array on disk.
+    Both the image decoding and the blosc compression release
+    the GIL so this function can efficiently run in threads.
+    Args:
+        file_path (str): The path to the image file
+        img_blosc_path (str): The path to the resulting blosc array
+        cparams (bcolz.cparams): The blosc compression parameters
+    """
+    image = cv2.imread(file_path, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        raise ValueError("Could not decode image: {}".format(file_path))
+    if image.ndim == 3:
+        # Keep the RGB(A) order skimage used to return
+        if image.shape[2] == 4:
+            image = cv2.cvtColor(image, cv2.COLOR_BGRA2RGBA)
+        else:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    img = bcolz.carray(image, rootdir=img_blosc_path, mode="w", cparams=cparams)
+    img.flush()
+
+
+def to_blosc_arrays(files, to_dir, clevel=5, cname="lz4"):
     """
     Turn a list of images to blosc and return the path
     to these images. Images stored as blosc on disk are read
     much faster than standard image formats.
 
-    If the cached files already exists they won't be cached again.
+    The images are compressed with the blosc shuffle filter which
+    uses the SIMD fast path on uint8 image data, giving both a
+    smaller on-disk footprint and faster reads.
+    The caching is done in parallel across all the CPU cores.
+    If the cached files already exists they won't be cached again,
+    so an interrupted run will resume where it stopped.
     Args:
         files (list): A list of image files
         to_dir (str): The path to the stored blosc arrays
+        clevel (int): The blosc compression level (0-9)
+        cname (str): The blosc compressor to use ("lz4" for speed,
+            "lz4hc" or "zstd" for a better compression ratio)
     Returns:
         list: A list of paths to the blosc images
     """
-    files_exists = True
     blosc_files = []
     if not os.path.exists(to_dir):
         os.makedirs(to_dir)
 
+    to_cache = []
     for file_path in files:
         _, file_name = os.path.split(file_path)
         img_blosc_path = os.path.join(to_dir, file_name)
         blosc_files.append(img_blosc_path)
         if not os.path.isdir(img_blosc_path):
-            files_exists = False
+            to_cache.append((file_path, img_blosc_path))
 
-    if files_exists:
+    if not to_cache:
         print("Cache files already generated")
     else:
-        for file_path, img_blosc_path in tqdm(zip(files, blosc_files), desc="Caching files", total=len(files)):
-            image = io.imread(file_path)
-            img = bcolz.carray(image, rootdir=img_blosc_path, mode="w")
-            img.flush()
+        cparams = bcolz.cparams(clevel=clevel, shuffle=bcolz.SHUFFLE, cname=cname)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(_cache_one, file_path, img_blosc_path, cparams)
+                       for file_path, img_blosc_path in to_cache]
+            for future in tqdm(as_completed(futures), desc="Caching files", total=len(futures)):
+                future.result()
 
     return blosc_files
 
 
+def _cache_one_memmap(memmap, i, file_path):
+    """
+    Decode one image into the given row of the memmap.
+    cv2.imdecode releases the GIL so this function can
+    efficiently run in threads.
+    Args:
+        memmap (np.memmap): The destination memory mapped array
+        i (int): The row to fill
+        file_path (str): The path to the image file
+    """
+    image = cv2.imdecode(np.fromfile(file_path, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Could not decode image: {}".format(file_path))
+    # Keep the same RGB order as the blosc cache
+    memmap[i] = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def to_memmap_array(files, out_path, shape, dtype=np.uint8):
+    """
+    Turn a list of same-sized images into a single memory mapped
+    array of shape (len(files), *shape) and return its path.
+
+    Unlike to_blosc_arrays which creates one directory per image,
+    a single memmap gives O(1) random access with no decompression
+    and no per-sample file open: readers can open it with
+    np.memmap(out_path, mode="r", ...) and hand slices directly to
+    torch.from_numpy.
+    The caching is done in parallel across all the CPU cores.
+    If the cache file already exists it won't be generated again.
+    Args:
+        files (list): A list of image files, all decoding to the same shape
+        out_path (str): The path to the resulting memmap file
+        shape (tuple): The (H, W, C) shape shared by all the images
+        dtype (np.dtype): The dtype of the stored images
+    Returns:
+        str: The path to the memmap file
+    """
+    if os.path.isfile(out_path):
+        print("Cache file already generated")
+        return out_path
+
+    # Fill a temporary file and only rename it into place once complete,
+    # so an interrupted run regenerates instead of serving a partial cache
+    tmp_path = out_path + ".tmp"
+    memmap = np.memmap(tmp_path, mode="w+", shape=(len(files), *shape), dtype=dtype)
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(_cache_one_memmap, memmap, i, file_path)
+                       for i, file_path in enumerate(files)]
+            for future in tqdm(as_completed(futures), desc="Caching files", total=len(futures)):
+                future.result()
+        memmap.flush()
+    except BaseException:
+        del memmap
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def split_by_idx(idxs, *a):
+    """
+    Split each of the given arrays in two parts: the elements at
+    the given indexes and the rest.
+    Useful to carve a validation set out of a training set.
+    Args:
+        idxs (list): The indexes to extract
+        *a: One or more numpy arrays, all of the same length
+    Returns:
+        list: A list of (extracted, rest) tuples, one per given array
+    """
+    n = len(a[0])
+    mask = np.zeros(n, dtype=bool)
+    mask[np.asarray(idxs)] = True
+    # Materialize the complement once instead of inverting the mask per array
+    inv = ~mask
+    return [(o[mask], o[inv]) for o in a]
+
+
 def create_dir_if_not_exists(path):
     """
     If the given path does not exists create them recursively
@@ -85,9 +198,10 @@ def get_files(path):
     Returns:
         list: A list of files
     """
-    all_files = os.listdir(path)
-    ret_files = [os.path.join(path, file) for file in all_files if os.path.isfile(os.path.join(path, file))]
-    return ret_files
+    # scandir caches the file type from the directory read,
+    # avoiding one stat syscall per entry
+    with os.scandir(path) as entries:
+        return [entry.path for entry in entries if entry.is_file()]
 
 
 def get_file_names(file_paths, with_extension=True):
@@ -120,14 +234,27 @@ def get_labels_from_folders(path, y_mapping=None):
         give that mapping here in the form of {index: label}
 
     Returns:
-        files (tuple): A tuple containing (file_path, label)
+        files (bcolz.ctable): A table with a "path" and an int32 "label" column
         y_mapping (dict): The mapping between the label and their index
     """
-    y_all = [label for label in os.listdir(path) if os.path.isdir(os.path.join(path, label))]
+    with os.scandir(path) as entries:
+        y_all = [entry.name for entry in entries if entry.is_dir()]
     if not y_mapping:
         y_mapping = {v: int(k) for k, v in enumerate(y_all)}
 
-    files = [[(os.path.join(path, label, file), y_mapping[label]) for file in
-              os.listdir(os.path.join(path, label))] for label in y_all]
-    files = np.array(files).reshape(-1, 2)
+    paths = []
+    labels = []
+    for label in y_all:
+        label_dir = os.path.join(path, label)
+        # The label is constant for the whole folder, look it up once
+        label_idx = y_mapping[label]
+        for entry in os.scandir(label_dir):
+            if entry.is_file():
+                paths.append(entry.path)
+                labels.append(label_idx)
+
+    # Columnar layout: the labels stay a contiguous int32 array instead of
+    # boxed ints interleaved with the paths in one object array
+    files = bcolz.ctable(columns=[np.asarray(paths, dtype=object), np.asarray(labels, dtype=np.int32)],
+                         names=["path", "label"])
     return files, y_mapping
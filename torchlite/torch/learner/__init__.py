@@ -38,8 +38,10 @@ class Learner:
         logs = {"step": step, "batch_size": batch_size}
         for ind, (*inputs, targets) in enumerate(loader):
             callback_list.on_batch_begin(ind, logs=logs)
-            inputs = [i.to(self.device) for i in inputs]
-            targets = targets.to(self.device)
+            # With a DataLoader configured with pin_memory=True these copies
+            # are asynchronous and overlap with the previous batch compute
+            inputs = [i.to(self.device, non_blocking=True) for i in inputs]
+            targets = targets.to(self.device, non_blocking=True)
 
             # Need to detach otherwise the Tensor gradients will accumulate in GPU memory
             logits = self.learner_core.on_forward_batch(step, inputs, targets).detach()
@@ -95,7 +97,9 @@ class Learner:
             metrics (list, None): Metrics to be evaluated by the model
                         during training and testing.
                         Typically you will use `metrics=['accuracy']`.
-            train_loader (DataLoader): The Dataloader for training
+            train_loader (DataLoader): The Dataloader for training.
+                Pass pin_memory=True and num_workers > 0 to the DataLoader so
+                the host to device copies overlap with the GPU compute
             valid_loader (DataLoader, optional): The Dataloader for validation
             callbacks (list, None): List of train callbacks functions
         """
@@ -150,7 +154,7 @@ class Learner:
         with torch.no_grad():
             for ind, (*inputs, _) in enumerate(test_loader):
                 callback_list.on_batch_begin(ind, logs={"batch_size": batch_size})
-                inputs = [i.to(self.device) for i in inputs]
+                inputs = [i.to(self.device, non_blocking=True) for i in inputs]
 
                 # Need to detach and move to CPU otherwise the Tensor and gradients will accumulate in GPU memory
                 logits = self.learner_core.on_forward_batch("prediction", inputs).cpu().detach()
@@ -79,8 +79,16 @@ class ClassifierCore(BaseCore):
         self.crit = criterion
         self.optim = optimizer
         self.model = model
-        self.logs = {}
         self.avg_meter = tensor_tools.AverageMeter()
+        self.epoch_log_name = None
+        # The nested structure is created once and mutated in place
+        # to avoid rebuilding short-lived dicts in the batch loop
+        self.logs = {"batch_logs": {}, "epoch_logs": {}}
+        # Resolve the step once per batch with a single dict lookup
+        # instead of chained string compares
+        self._step_dispatch = {"training": self._on_training_batch,
+                               "validation": self._on_validation_batch,
+                               "prediction": self._on_prediction_batch}
 
     @property
     def get_models(self):
@@ -88,11 +96,16 @@ class ClassifierCore(BaseCore):
 
     @property
     def get_logs(self):
+        # Materialize the device-side losses only when the logs are read
+        if self.avg_meter.count > 0:
+            self.logs["batch_logs"]["loss"] = float(self.avg_meter.val)
+            self.logs["epoch_logs"][self.epoch_log_name] = float(self.avg_meter.avg)
         return self.logs
 
     def on_new_epoch(self):
-        self.logs = {}
+        self.logs = {"batch_logs": {}, "epoch_logs": {}}
         self.avg_meter = tensor_tools.AverageMeter()
+        self.epoch_log_name = None
 
     def on_train_mode(self):
         self.model.train()
@@ -103,27 +116,35 @@ class ClassifierCore(BaseCore):
     def to_device(self, device):
         self.model.to(device)
 
-    def on_forward_batch(self, step, inputs, targets=None):
+    def _on_training_batch(self, inputs, targets):
         # forward
         logits = self.model.forward(*inputs)
+        loss = self.crit(logits, targets)
+
+        # Accumulate the detached loss on device, syncing it back
+        # to the host here would stall the pipeline on every batch
+        self.avg_meter.update_tensor(loss.detach())
+        self.epoch_log_name = "train loss"
 
-        if step != "prediction":
-            loss = self.crit(logits, targets)
-
-            # Update logs
-            self.avg_meter.update(loss.item())
-            self.logs.update({"batch_logs": {"loss": loss.item()}})
-
-            # backward + optimize
-            if step == "training":
-                self.optim.zero_grad()
-                loss.backward()
-                self.optim.step()
-                self.logs.update({"epoch_logs": {"train loss": self.avg_meter.avg}})
-            else:
-                self.logs.update({"epoch_logs": {"valid loss": self.avg_meter.avg}})
+        # backward + optimize
+        self.optim.zero_grad()
+        loss.backward()
+        self.optim.step()
+        return logits
+
+    def _on_validation_batch(self, inputs, targets):
+        logits = self.model.forward(*inputs)
+        loss = self.crit(logits, targets)
+        self.avg_meter.update_tensor(loss.detach())
+        self.epoch_log_name = "valid loss"
         return logits
 
+    def _on_prediction_batch(self, inputs, targets=None):
+        return self.model.forward(*inputs)
+
+    def on_forward_batch(self, step, inputs, targets=None):
+        return self._step_dispatch[step](inputs, targets)
+
 
 class SRPGanCore(BaseCore):
     def __init__(self, generator: Generator, discriminator: Discriminator,
@@ -144,6 +165,11 @@ class SRPGanCore(BaseCore):
         self.g_optim = g_optimizer
         self.netD = discriminator
         self.netG = generator
+        # Resolve the step once per batch with a single dict lookup
+        # instead of chained string compares
+        self._step_dispatch = {"training": self._on_training,
+                               "validation": self._on_validation,
+                               "eval": self._on_eval}
         self.on_new_epoch()
 
     def on_train_mode(self):
@@ -165,37 +191,50 @@ class SRPGanCore(BaseCore):
 
     @property
     def get_logs(self):
+        # Materialize the device-side losses only when the logs are read,
+        # the cat + tolist costs a single host sync for all of them
+        if self._loss_count > 0:
+            values = torch.cat((self._batch_losses[:2], self._loss_sum / self._loss_count)).tolist()
+            g_loss, d_loss, g_avg, d_avg, adversarial_avg, content_avg, perceptual_avg = values
+            batch_logs = self.logs["batch_logs"]
+            batch_logs["g_loss"] = g_loss
+            batch_logs["d_loss"] = d_loss
+            epoch_logs = self.logs["epoch_logs"]
+            epoch_logs["generator"] = g_avg
+            epoch_logs["discriminator"] = d_avg
+            epoch_logs["adversarial"] = adversarial_avg
+            epoch_logs["content"] = content_avg
+            epoch_logs["perceptual"] = perceptual_avg
         return self.logs
 
     def on_new_epoch(self):
-        self.logs = {}
-        self.g_avg_meter = tensor_tools.AverageMeter()
-        self.d_avg_meter = tensor_tools.AverageMeter()
-        self.adversarial_loss_meter = tensor_tools.AverageMeter()
-        self.content_loss_meter = tensor_tools.AverageMeter()
-        self.perceptual_loss_meter = tensor_tools.AverageMeter()
+        self.logs = {"batch_logs": {}, "epoch_logs": {}}
+        # Single device-resident accumulator for the 5 losses,
+        # lazily allocated on the losses' device
+        self._loss_sum = None
+        self._loss_count = 0
+        self._batch_losses = None
 
     def _update_loss_logs(self, g_loss, d_loss, adversarial_loss, content_loss, perceptual_loss):
-        # Update logs
-        self.g_avg_meter.update(g_loss)
-        self.d_avg_meter.update(d_loss)
-        self.adversarial_loss_meter.update(adversarial_loss)
-        self.content_loss_meter.update(content_loss)
-        self.perceptual_loss_meter.update(perceptual_loss)
-
-        self.logs.update({"batch_logs": {"g_loss": g_loss, "d_loss": d_loss}})
-        self.logs.update({"epoch_logs": {"generator": self.g_avg_meter.avg,
-                                         "discriminator": self.d_avg_meter.avg,
-                                         "adversarial": self.adversarial_loss_meter.avg,
-                                         "content": self.content_loss_meter.avg,
-                                         "perceptual": self.perceptual_loss_meter.avg}})
-
-    def _on_eval(self, images):
-        sr_images = self.netG(images)  # Super resolution images
+        # The losses are detached tensors: they are stacked into one
+        # device-resident tensor and only synced to the host on log reads
+        losses = torch.stack((g_loss, d_loss, adversarial_loss, content_loss, perceptual_loss))
+        if self._loss_sum is None:
+            self._loss_sum = torch.zeros_like(losses)
+        self._loss_sum += losses
+        self._loss_count += 1
+        self._batch_losses = losses
+
+    def _on_eval(self, images, targets=None):
+        # No backward follows, skip the autograd bookkeeping
+        with torch.no_grad():
+            sr_images = self.netG(images)  # Super resolution images
         return sr_images
 
     def _on_validation(self, lr_images, hr_images):
-        sr_images = self.netG(lr_images)
+        # No backward follows, skip the autograd bookkeeping
+        with torch.no_grad():
+            sr_images = self.netG(lr_images)
 
         return sr_images
 
@@ -206,28 +245,34 @@ class SRPGanCore(BaseCore):
 
     def _on_training(self, lr_images, hr_images):
         sr_images = self.netG(lr_images)
-        d_hr_out, d_hr_feat_maps = self.netD(hr_images)  # Sigmoid output
-        d_sr_out, d_sr_feat_maps = self.netD(sr_images)  # Sigmoid output
-
-        # torchlite.torch.losses.srpgan.GeneratorLoss
-        g_loss, adversarial_loss, content_loss, perceptual_loss = self.g_criterion(d_hr_out, d_sr_out,
-                                                                                   d_hr_feat_maps, d_sr_feat_maps,
-                                                                                   sr_images, hr_images)
 
+        # Discriminator step on the detached sr images so its backward
+        # doesn't have to retain the generator graph
+        d_hr_out, d_hr_feat_maps = self.netD(hr_images)  # Logits output
+        d_sr_out, _ = self.netD(sr_images.detach())  # Logits output
         d_loss = self.d_criterion(d_hr_out, d_sr_out)
 
-        self._optimize(self.netD, self.d_optim, d_loss, retain_graph=True)
+        # The hr images are only fixed targets for the generator: their
+        # features from this single discriminator pass are reused detached
+        # below instead of running netD on hr_images a second time
+        hr_out_target = d_hr_out.detach()
+        hr_feat_targets = [feat_map.detach() for feat_map in d_hr_feat_maps]
+
+        self._optimize(self.netD, self.d_optim, d_loss)
+
+        # Generator step with a fresh discriminator forward on the sr images
+        d_sr_out, d_sr_feat_maps = self.netD(sr_images)
+
+        # torchlite.torch.losses.srpgan.GeneratorLoss
+        g_loss, adversarial_loss, content_loss, perceptual_loss = self.g_criterion(hr_out_target, d_sr_out,
+                                                                                   hr_feat_targets, d_sr_feat_maps,
+                                                                                   sr_images, hr_images)
         self._optimize(self.netG, self.g_optim, g_loss)
 
-        self._update_loss_logs(g_loss, d_loss, adversarial_loss, content_loss, perceptual_loss)
+        self._update_loss_logs(g_loss.detach(), d_loss.detach(), adversarial_loss.detach(),
+                               content_loss.detach(), perceptual_loss.detach())
 
         return sr_images
 
     def on_forward_batch(self, step, inputs, targets=None):
-        self.logs = {}
-        if step == "training":
-            return self._on_training(*inputs, targets)
-        elif step == "validation":
-            return self._on_validation(*inputs, targets)
-        elif step == "eval":
-            return self._on_eval(*inputs)
+        return self._step_dispatch[step](*inputs, targets)
@@ -1,5 +1,4 @@
 import torch
-import numpy as np
 import torch.nn.functional as F
 from torchlite.torch.losses import CharbonnierLoss
 
@@ -11,10 +10,15 @@ class GeneratorLoss:
         """
         super(GeneratorLoss, self).__init__()
         self.charbonnier = CharbonnierLoss()
+        self._real_labels = None
 
     def __call__(self, d_hr_out, d_sr_out, d_hr_feat_maps, d_sr_feat_maps, sr_images, target_images):
-        # Adversarial loss (takes discriminator outputs)
-        adversarial_loss = 0.001 * F.binary_cross_entropy(d_sr_out, torch.ones_like(d_sr_out))
+        # The labels have a constant shape across batches, allocate them once
+        if self._real_labels is None or self._real_labels.shape != d_sr_out.shape:
+            self._real_labels = torch.ones_like(d_sr_out)
+
+        # Adversarial loss (takes discriminator logits)
+        adversarial_loss = 0.001 * F.binary_cross_entropy_with_logits(d_sr_out, self._real_labels)
 
         # Content loss (charbonnier between target and super resolution images)
         content_loss = self.charbonnier(sr_images, target_images, eps=1e-8)
@@ -37,13 +41,19 @@ class DiscriminatorLoss:
         The Discriminator loss
         """
         super(DiscriminatorLoss, self).__init__()
+        self._real_labels = None
+        self._fake_labels = None
 
     def __call__(self, d_hr_out, d_sr_out):
-        # Labels smoothing
-        real_labels = np.random.uniform(0.7, 1.2, size=d_hr_out.size())
-        real_labels = torch.FloatTensor(real_labels).to(d_hr_out.get_device())
+        # The labels have a constant shape across batches, allocate them once
+        if self._real_labels is None or self._real_labels.shape != d_hr_out.shape:
+            self._real_labels = torch.empty_like(d_hr_out)
+            self._fake_labels = torch.zeros_like(d_sr_out)
+
+        # Labels smoothing, drawn directly on device
+        real_labels = self._real_labels.uniform_(0.7, 1.2)
 
-        d_hr_loss = F.binary_cross_entropy(d_hr_out, real_labels)
-        d_sr_loss = F.binary_cross_entropy(d_sr_out, torch.zeros_like(d_sr_out))
+        d_hr_loss = F.binary_cross_entropy_with_logits(d_hr_out, real_labels)
+        d_sr_loss = F.binary_cross_entropy_with_logits(d_sr_out, self._fake_labels)
 
         return d_hr_loss + d_sr_loss
@@ -125,10 +125,11 @@ class Discriminator(nn.Module):
 
         in_size = self.infer_lin_size(input_shape)
 
+        # Emits logits, the losses use binary_cross_entropy_with_logits
+        # which fuses the sigmoid in a numerically stable way
         self.out_block = nn.Sequential(
             Flatten(),
             nn.Linear(in_size, 1),
-            nn.Sigmoid(),
         )
 
     def infer_lin_size(self, shape):
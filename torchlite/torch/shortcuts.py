@@ -144,11 +144,11 @@ class ImageClassifierShortcut(BaseLoader):
         datasets = []
 
         files, y_mapping = tfiles.get_labels_from_folders(train_folder)
-        datasets.append(ImageClassificationDataset(files[:, 0], files[:, 1], transforms=transforms))
+        datasets.append(ImageClassificationDataset(files["path"][:], files["label"][:], transforms=transforms))
 
         if val_folder:
             files, _ = tfiles.get_labels_from_folders(val_folder, y_mapping)
-            datasets.append(ImageClassificationDataset(files[:, 0], files[:, 1], transforms=transforms))
+            datasets.append(ImageClassificationDataset(files["path"][:], files["label"][:], transforms=transforms))
         else:
             datasets.append(None)
 
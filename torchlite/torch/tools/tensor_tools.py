@@ -22,6 +22,18 @@ class AverageMeter(object):
         self.count += 1
         self.sum += val
 
+    def update_tensor(self, val):
+        """
+        Same as update() but meant for a detached tensor: the running
+        sum stays on the tensor's device so no host synchronization
+        happens here. Read val/avg back with float() once needed.
+        Args:
+            val (Tensor): A detached 0-dim tensor
+        """
+        self.val = val
+        self.count += 1
+        self.sum = self.sum + val
+
     @property
     def avg(self):
         return self.sum / self.count